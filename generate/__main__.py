@@ -126,8 +126,12 @@ for generator_type, generator_cls in targets.iteritems():
     fpath = os.path.join(fpath, fname)
 
     # Write generated output to file system.
-    with open(fpath, 'w') as fstream:
-        fstream.write(generator.get_output())
+    write_output = getattr(generator, 'write_output', None)
+    if write_output is not None:
+        write_output(fpath)
+    else:
+        with open(fpath, 'w') as fstream:
+            fstream.write(generator.get_output())
 
     logging_output.append((fname.split('.')[-1], fpath))
 
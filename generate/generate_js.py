@@ -21,6 +21,11 @@ from utils_parser import SpecializationParser
 
 
 
+# Output template split either side of the topic placeholder.
+with open('{}/generate_js.template'.format(os.path.dirname(__file__))) as _fstream:
+    _TEMPLATE_HEAD, _TEMPLATE_TAIL = _fstream.read().split('TOPIC', 1)
+
+
 class Generator(SpecializationParser):
     """Specialization to Javascript generator.
 
@@ -31,7 +36,7 @@ class Generator(SpecializationParser):
         """
         super(Generator, self).__init__(project, root)
 
-        self._maps = collections.OrderedDict()
+        self._output = None
         self.on_grid_parse = self.on_topic_parse
         self.on_keyprops_parse = self.on_topic_parse
         self.on_process_parse = self.on_topic_parse
@@ -41,10 +46,9 @@ class Generator(SpecializationParser):
         """Returns generated output as a text blob.
 
         """
-        data = json.dumps(self._maps[self.root])
-        fpath = '{}/generate_js.template'.format(os.path.dirname(__file__))
-        with open(fpath) as fstream:
-            return fstream.read().replace('TOPIC', data)
+        data = json.dumps(self._output, separators=(',', ':'))
+
+        return _TEMPLATE_HEAD + data + _TEMPLATE_TAIL
 
 
     def on_root_parse(self, root):
@@ -64,21 +68,25 @@ class Generator(SpecializationParser):
         obj['label'] = get_label(root.name)
         obj['description'] = root.description
         obj['contact'] = root.contact
-        obj['authors'] = [i.strip() for i in root.authors.split(',')]
-        obj['contributors'] = [i.strip() for i in root.contributors.split(',')]
+        obj['authors'] = _split_csv(root.authors)
+        obj['contributors'] = _split_csv(root.contributors)
         obj['project'] = 'cordex'
         obj['changeHistory'] = [_get_change(i) for i in root.change_history]
         obj['subTopics'] = []
 
-        self._maps[root] = obj
+        root._json_obj = obj
 
 
     def on_root_parsed(self, root):
         """On root parsed event handler.
 
         """
-        for obj in [self._maps[i] for i in self.root.sub_topics]:
-            self._maps[root]['subTopics'].append(obj)
+        self._output = root._json_obj
+        self._output['subTopics'] = [i._json_obj for i in root.sub_topics]
+
+        # Release objects attached to (shared) specialization nodes.
+        for topic in [root] + root.sub_topics:
+            del topic._json_obj
 
 
     def on_topic_parse(self, topic):
@@ -92,7 +100,7 @@ class Generator(SpecializationParser):
         obj['contact'] = topic.contact
         obj['properties'] = []
 
-        self._maps[topic] = obj
+        topic._json_obj = obj
 
 
     def on_property_parse(self, prop): 
@@ -101,7 +109,7 @@ class Generator(SpecializationParser):
         """
         obj = collections.OrderedDict()
         obj['id'] = prop.id
-        obj['label'] = " > ".join([get_label(i) for i in prop.id.split('.')[3:]])
+        obj['label'] = " > ".join(get_label(i) for i in prop.id.split('.')[3:])
         obj['description'] = prop.description
         obj['cardinality'] = prop.cardinality
         obj['type'] = "enum" if prop.enum else prop.typeof
@@ -109,7 +117,7 @@ class Generator(SpecializationParser):
         if prop.enum:
             obj['enum'] = self._get_enum(prop.enum)
 
-        properties = self._maps[prop.root_topic]['properties']
+        properties = prop.root_topic._json_obj['properties']
         properties.append(obj)
 
 
@@ -122,11 +130,15 @@ class Generator(SpecializationParser):
         obj['label'] = get_label(enum.name)
         obj['description'] = enum.description
         obj['is_open'] = enum.is_open
-        obj['choices'] = []
-        for choice in enum:
-            obj['choices'].append({
-                'description': choice.description,
-                'value': choice.value
-                })
+        obj['choices'] = [
+            {'description': i.description, 'value': i.value} for i in enum
+            ]
 
         return obj
+
+
+def _split_csv(value):
+    """Returns a comma separated string as a list of stripped items.
+
+    """
+    return [i.strip() for i in value.split(',')] if value else []
@@ -9,43 +9,61 @@
 
 
 """
-import collections
+import io
 import json
 import os
 
-import xml.etree.ElementTree as ET
-
+from utils import log
 from utils_constants import *
-from utils_model import PropertySpecialization
-from utils_model import TopicSpecialization
 from utils_parser import SpecializationParser
 
+try:
+    from lxml.etree import Element, ElementTree, SubElement, iselement
+except ImportError:
+    try:
+        from xml.etree.cElementTree import Element, ElementTree, SubElement, iselement
+    except ImportError:
+        from xml.etree.ElementTree import Element, ElementTree, SubElement, iselement
+        log("WARNING :: C ElementTree unavailable, mindmap generation will be slow")
 
-# HTML snippet for a set of notes.
-_NOTES_HTML = """
-<html>
-  <head></head>
-  <body>
-    <dl>
-        {}
-    </dl>
-  </body>
-</html>
-"""
-
-# HTML snippet for a note.
-_NOTE_HTML = "<dt><b>{}</b></dt><dd>{}</dd>"
 
 # Mind-map sections.
-_SECTIONS = collections.OrderedDict()
-_SECTIONS[TYPE_KEY_ENUM_CHOICE] = None
-_SECTIONS[TYPE_KEY_GRID] = "science.topic"
-_SECTIONS[TYPE_KEY_KEYPROPS] = "science.topic"
-_SECTIONS[TYPE_KEY_PROCESS] = "science.topic"
-_SECTIONS[TYPE_KEY_PROPERTY] = None
-_SECTIONS[TYPE_KEY_PROPERTY_SET] = None
-_SECTIONS[TYPE_KEY_REALM] = "science.realm"
-_SECTIONS[TYPE_KEY_SUBPROCESS] = "science.topic"
+_SECTIONS = (
+    TYPE_KEY_ENUM_CHOICE,
+    TYPE_KEY_GRID,
+    TYPE_KEY_KEYPROPS,
+    TYPE_KEY_PROCESS,
+    TYPE_KEY_PROPERTY,
+    TYPE_KEY_PROPERTY_SET,
+    TYPE_KEY_REALM,
+    TYPE_KEY_SUBPROCESS,
+)
+
+# Mind-map notes common to all nodes: (label, attribute) pairs.
+_NOTES_DEFAULT = (
+    ("Description", "description"),
+    ("Spec. ID", "id"),
+)
+
+# Mind-map notes for property nodes.
+_NOTES_PROPERTY = _NOTES_DEFAULT + (
+    ("Type", "typeof"),
+    ("Cardinality", "cardinality"),
+    ("Specialization ID", "id"),
+)
+
+# Mind-map notes for root nodes.
+_NOTES_ROOT = _NOTES_DEFAULT + (
+    ("Contact", "contact"),
+    ("Authors", "authors"),
+    ("Contributors", "contributors"),
+)
+
+# Map of type keys to mind-map notes, others default to _NOTES_DEFAULT.
+_NOTES = {
+    TYPE_KEY_PROPERTY: _NOTES_PROPERTY,
+    TYPE_KEY_REALM: _NOTES_ROOT,
+}
 
 
 class _Configuration(object):
@@ -57,13 +75,21 @@ class _Configuration(object):
 
         """
         self._data = _CONFIG
+        self._prepared = {intern(k): _prepare_section(v) for k, v in _CONFIG.items()}
 
 
     def get_section(self, key):
         """Returns a section within the config file.
 
         """
-        return self._data.get(key, {})
+        return self._data.get(key, self._data[TYPE_KEY_PROPERTY])
+
+
+    def get_prepared(self, key):
+        """Returns a section's mindmap node & font attributes.
+
+        """
+        return self._prepared.get(key, self._prepared[TYPE_KEY_PROPERTY])
 
 
 class Generator(SpecializationParser):
@@ -78,26 +104,48 @@ class Generator(SpecializationParser):
 
         self.cfg = _Configuration()
         self.mmap = None
-        self.nodes = {}
+        self._emitted = []
 
 
     def get_output(self):
         """Returns generated output as a text blob.
 
         """
-        return ET.tostring(self.mmap)
+        fstream = io.BytesIO()
+        self.write_output(fstream)
+
+        return fstream.getvalue()
+
+
+    def write_output(self, target):
+        """Streams generated output to a file.
+
+        :param str|file target: Path or file-like object to be written to.
+
+        """
+        ElementTree(self.mmap).write(target)
 
 
     def on_root_parse(self, root):
         """On root parse event handler.
 
         """
-        self.mmap = ET.Element('map', {})
+        self.mmap = Element('map', {})
         self._emit_node(self.mmap, root, style="fork")
         self._emit_change_history(root)
         self._emit_legend(root)
 
 
+    def on_root_parsed(self, root):
+        """On root parsed event handler.
+
+        """
+        # Release mindmap nodes attached to (shared) specialization nodes.
+        for owner in self._emitted:
+            del owner._mm_node
+        self._emitted = []
+
+
     def on_grid_parse(self, grid):
         """On grid parse event handler.
 
@@ -158,98 +206,88 @@ class Generator(SpecializationParser):
     def _emit_node(self, parent, owner, text=None, style="bubble"):
         """Sets a mindmap node.
 
+        :param object parent: Parent specialization or mindmap element.
+        :param object owner: Specialization being emitted.
+        :param str text: Node text, defaults to owner name.
+        :param str style: Node style.
+
         """
         # Get section style config.
-        cfg = self.cfg.get_section(owner.type_key)
+        type_key = owner.type_key
+        cfg = self.cfg.get_prepared(type_key)
 
         # Initialise mindmap node attributes.
         atts = {
-            'FOLDED': str(cfg['is-collapsed']).lower(),
-            'COLOR': cfg['font-color'],
-            'BACKGROUND_COLOR': cfg['bg-color'],
+            'FOLDED': cfg['FOLDED'],
+            'COLOR': cfg['COLOR'],
+            'BACKGROUND_COLOR': cfg['BACKGROUND_COLOR'],
             'STYLE': style,
-            'TEXT': text if text else owner.name
+            'TEXT': text or owner.name
         }
 
         # Set node url.
-        try:
-            owner.url
-        except AttributeError:
-            pass
-        else:
-            atts['LINK'] = owner.url
+        url = getattr(owner, 'url', None)
+        if url is not None:
+            atts['LINK'] = url
 
         # Get node parent.
-        if not isinstance(parent, ET.Element):
-            parent = self.nodes[parent]
+        if not iselement(parent):
+            parent = parent._mm_node
 
         # Create new node & cache.
-        self.nodes[owner] = ET.SubElement(parent, 'node', atts)
+        node = owner._mm_node = SubElement(parent, 'node', atts)
+        self._emitted.append(owner)
 
         # Set node font / notes.
-        self._emit_font(owner, cfg)
-        self._emit_notes(owner)
-
-
-    def _emit_font(self, owner, cfg):
-        """Set node font information.
-
-        """
-        ET.SubElement(self.nodes[owner], 'font', {
-            'BOLD': str(cfg['font-bold']),
-            'NAME': cfg['font-name'],
-            'SIZE': str(cfg['font-size'])
+        SubElement(node, 'font', {
+            'BOLD': cfg['BOLD'],
+            'NAME': cfg['NAME'],
+            'SIZE': cfg['SIZE']
             })
+        if cfg['verbose-notes']:
+            _append_notes(node, _get_note_values(owner, type_key))
 
 
     def _emit_notes(self, owner, notes=None):
         """Set mindmap notes.
 
+        :param object owner: Specialization or mindmap element to be annotated.
+        :param list notes: Set of (label, value) pairs, derived from owner if omitted.
+
         """
         # Set parent mm node.
-        parent = owner if isinstance(owner, ET.Element) else \
-                 self.nodes[owner]
+        parent = owner if iselement(owner) else owner._mm_node
 
         # Set notes.
-        notes = notes or _get_notes(owner)
+        if notes is None:
+            type_key = owner.type_key
+            if not self.cfg.get_prepared(type_key)['verbose-notes']:
+                return
+            notes = _get_note_values(owner, type_key)
 
-        # Convert to HTML.
-        html = []
-        for k, value in notes:
-            try:
-                owner.id
-            except AttributeError:
-                pass
-            else:
-                value = value(owner)
-            html.append(_NOTE_HTML.format(k, value))
-        html = _NOTES_HTML.format("".join(html))
-
-        # Extend mindmap.
-        node = ET.SubElement(parent, 'richcontent', {"TYPE": "NOTE"})
-        node.append(ET.fromstring(html))
+        _append_notes(parent, notes)
 
 
     def _emit_legend(self, root):
         """Emits mindmap legend.
 
         """
-        cfg = self.cfg.get_section
-        root_node = ET.SubElement(self.nodes[root], 'node', {
+        root_node = SubElement(root._mm_node, 'node', {
             'FOLDED': "true",
             'STYLE': "bubble",
             'TEXT': "LEGEND",
             'POSITION': "left"
             })
         for section in _SECTIONS:
-            node = ET.SubElement(root_node, 'node', {
-                'BACKGROUND_COLOR': cfg(section)['bg-color'],
-                'COLOR': cfg(section)['font-color'],
+            cfg = self.cfg.get_prepared(section)
+            node = SubElement(root_node, 'node', {
+                'BACKGROUND_COLOR': cfg['BACKGROUND_COLOR'],
+                'COLOR': cfg['COLOR'],
                 'STYLE': "bubble",
                 'TEXT': section
                 })
             self._emit_notes(node, notes=[
-                ('Description', cfg(section)['description']),
+                ('Description', self.cfg.get_section(section)['description']),
                 ])
 
 
@@ -257,14 +295,14 @@ class Generator(SpecializationParser):
         """Emits change history.
 
         """
-        root_node = ET.SubElement(self.nodes[root], 'node', {
+        root_node = SubElement(root._mm_node, 'node', {
             'FOLDED': "true",
             'STYLE': "bubble",
             'TEXT': "CHANGE HISTORY",
             'POSITION': "left"
             })
         for version, date, person, comment in root.change_history:
-            node = ET.SubElement(root_node, 'node', {
+            node = SubElement(root_node, 'node', {
                 'STYLE': "bubble",
                 'TEXT': version
                 })
@@ -276,31 +314,66 @@ class Generator(SpecializationParser):
             ])
 
 
-def _get_notes(spec):
+def _get_notes(type_key):
     """Returns notes to be appended to a mindmap node.
 
     """
-    result = [
-        ("Description", lambda i: "N/A" if i.description is None else i.description.replace("&", "and")),
-        ("Spec. ID", lambda i: i.id),
-    ]
-
-    if isinstance(spec, PropertySpecialization):
-        result += [
-            ("Type", lambda i: i.typeof),
-            ("Cardinality", lambda i: i.cardinality),
-            ("Specialization ID", lambda i: i.id)
-        ]
-
-    elif isinstance(spec, TopicSpecialization) and spec.parent is None:
-        result += [
-            ("Contact", lambda i: i.contact),
-            ("Authors", lambda i: i.authors),
-            ("Contributors", lambda i: i.contributors)
-        ]
+    return _NOTES.get(type_key, _NOTES_DEFAULT)
+
+
+def _get_note_values(spec, type_key):
+    """Returns (label, value) pairs to be appended to a mindmap node.
+
+    :param object spec: Specialization being emitted.
+    :param str type_key: Specialization type key.
+
+    """
+    result = []
+    for k, attr in _get_notes(type_key):
+        value = getattr(spec, attr)
+        if attr == 'description':
+            value = "N/A" if value is None else value.replace("&", "and")
+        result.append((k, value))
 
     return result
 
+
+def _append_notes(node, notes):
+    """Appends a set of (label, value) pairs to a mindmap node as HTML notes.
+
+    :param Element node: Mindmap element to be annotated.
+    :param list notes: Set of (label, value) pairs.
+
+    """
+    # Skip notes devoid of information.
+    if not any(v and v != "N/A" for _, v in notes):
+        return
+
+    # Extend mindmap with HTML scaffolding.
+    html = SubElement(SubElement(node, 'richcontent', {"TYPE": "NOTE"}), 'html')
+    SubElement(html, 'head')
+    dl = SubElement(SubElement(html, 'body'), 'dl')
+
+    # Append notes.
+    for k, value in notes:
+        SubElement(SubElement(dl, 'dt'), 'b').text = k
+        SubElement(dl, 'dd').text = value
+
+
+def _prepare_section(cfg):
+    """Returns a config section's mindmap attributes as pre-formatted strings.
+
+    """
+    return {
+        'FOLDED': str(cfg['is-collapsed']).lower(),
+        'COLOR': cfg['font-color'],
+        'BACKGROUND_COLOR': cfg['bg-color'],
+        'BOLD': str(cfg['font-bold']),
+        'NAME': cfg['font-name'],
+        'SIZE': str(cfg['font-size']),
+        'verbose-notes': cfg['verbose-notes']
+    }
+
 # Mindmap configuration.
 _CONFIG = {
 	"model": {
@@ -310,6 +383,7 @@ _CONFIG = {
 		"font-name": "courier",
 		"font-size": 14,
 		"is-collapsed": False,
+		"verbose-notes": True,
 		"description": "A model component."
 	},
 	"realm": {
@@ -319,6 +393,7 @@ _CONFIG = {
 		"font-name": "courier",
 		"font-size": 14,
 		"is-collapsed": False,
+		"verbose-notes": True,
 		"description": "Scientific area of a numerical model."
 	},
 	"grid": {
@@ -328,6 +403,7 @@ _CONFIG = {
 		"font-name": "courier",
 		"font-size": 12,
 		"is-collapsed": False,
+		"verbose-notes": True,
 		"description": "The grid used to layout the variables (e.g. the Global ENDGAME-grid)."
 	},
 	"keyprops": {
@@ -337,6 +413,7 @@ _CONFIG = {
 		"font-name": "courier",
 		"font-size": 12,
 		"is-collapsed": False,
+		"verbose-notes": True,
 		"description": "Realm key properties which differ from model defaults (grid, timestep etc)."
 	},
 	"process": {
@@ -346,6 +423,7 @@ _CONFIG = {
 		"font-name": "courier",
 		"font-size": 12,
 		"is-collapsed": False,
+		"verbose-notes": True,
 		"description": "Process simulated within the realm."
 	},
 	"subprocess": {
@@ -355,6 +433,7 @@ _CONFIG = {
 		"font-name": "courier",
 		"font-size": 12,
 		"is-collapsed": False,
+		"verbose-notes": True,
 		"description": "A sub-process simulated within a realm process."
 	},
 	"property-set": {
@@ -364,6 +443,7 @@ _CONFIG = {
 		"font-name": "courier",
 		"font-size": 10,
 		"is-collapsed": True,
+		"verbose-notes": True,
 		"description": "Provides details of specific properties of a process, sub-process, key properties, etc.  There are two possible specialisations expected: (1) A detail_vocabulary is identified, and a cardinality is assigned to that for possible responses; (2) Detail is used to provide a collection or a set of properties which are defined in the sub-class."
 	},
 	"property": {
@@ -373,6 +453,7 @@ _CONFIG = {
 		"font-name": "courier",
 		"font-size": 10,
 		"is-collapsed": True,
+		"verbose-notes": True,
 		"description": "A property associated with a detail defined as a 4 member tuple: name, type, cardinality, description."
 	},
 	"enum-choice": {
@@ -382,6 +463,7 @@ _CONFIG = {
 		"font-name": "courier",
 		"font-size": 10,
 		"is-collapsed": True,
+		"verbose-notes": True,
 		"description": "A choice within an enumeration."
 	}
 }
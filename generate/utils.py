@@ -8,6 +8,10 @@
 
 
 """
+# Map of names to formatted labels.
+_LABELS = dict()
+
+
 def log(msg):
     """Outputs a message to log.
 
@@ -24,6 +28,8 @@ def get_label(name):
     """Returns a name formatted as a label for UI purposes.
 
     """
-    name = name.replace("_", " ")
+    if name not in _LABELS:
+        words = name.replace("_", " ").split(" ")
+        _LABELS[name] = " ".join("{}{}".format(n[0].upper(), n[1:]) for n in words)
 
-    return " ".join("{}{}".format(n[0].upper(), n[1:]) for n in name.split(" "))
+    return _LABELS[name]
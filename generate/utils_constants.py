@@ -8,16 +8,16 @@
 
 
 """
-# Specialization type keys.
-TYPE_KEY_ENUM = 'enum'
-TYPE_KEY_ENUM_CHOICE = 'enum-choice'
-TYPE_KEY_GRID = "grid"
-TYPE_KEY_KEYPROPS = "keyprops"
-TYPE_KEY_PROCESS = "process"
-TYPE_KEY_PROPERTY = "property"
-TYPE_KEY_PROPERTY_SET = "property-set"
-TYPE_KEY_REALM = "realm"
-TYPE_KEY_SUBPROCESS = "subprocess"
+# Specialization type keys: interned as they key per-node config lookups.
+TYPE_KEY_ENUM = intern('enum')
+TYPE_KEY_ENUM_CHOICE = intern('enum-choice')
+TYPE_KEY_GRID = intern('grid')
+TYPE_KEY_KEYPROPS = intern('keyprops')
+TYPE_KEY_PROCESS = intern('process')
+TYPE_KEY_PROPERTY = intern('property')
+TYPE_KEY_PROPERTY_SET = intern('property-set')
+TYPE_KEY_REALM = intern('realm')
+TYPE_KEY_SUBPROCESS = intern('subprocess')
 
 # Set of abbreviations that do not require converting.
 ABBREVIATIONS = {
@@ -227,7 +227,7 @@ class PropertySetSpecialization(object):
         self.properties = []
         self.property_sets = []
         self.topic = None
-        self.type_key = "property-set"
+        self.type_key = TYPE_KEY_PROPERTY_SET
 
 
     def __repr__(self):
@@ -286,7 +286,7 @@ class PropertySpecialization(object):
         self.owner = None
         self.topic = None
         self.typeof = None
-        self.type_key = "property"
+        self.type_key = TYPE_KEY_PROPERTY
         self.was_injected = False
 
 
@@ -414,7 +414,7 @@ class EnumSpecialization(object):
         self.is_open = False
         self.label = None
         self.name = None
-        self.type_key = "enum"
+        self.type_key = TYPE_KEY_ENUM
 
 
     def __repr__(self):
@@ -471,7 +471,7 @@ class EnumChoiceSpecialization(object):
         self.enum = None
         self.id = None
         self.value = None
-        self.type_key = "enum-choice"
+        self.type_key = TYPE_KEY_ENUM_CHOICE
 
         self.is_other = False
 